@@ -1,54 +1,116 @@
 import streamlit as st
 import os
-import json
-import base64
-import io
+import math
+
+try:
+    import orjson as json
+except ImportError:
+    import json
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 # ----------- FUNCTIONS ------------
 
-def display_notebook(notebook_path):
+CELLS_PER_PAGE = 10
+OUTPUT_EDGE_CHARS = 4096
+
+def _truncate_text(text):
+    """Keep only the head and tail of long output text"""
+    if len(text) <= 2 * OUTPUT_EDGE_CHARS:
+        return text
+    return text[:OUTPUT_EDGE_CHARS] + "\n...[truncated]...\n" + text[-OUTPUT_EDGE_CHARS:]
+
+def _classify_outputs(outputs):
+    """Flatten raw cell outputs into (kind, payload) tuples"""
+    outs = []
+    for output in outputs:
+        if output.get('output_type') == 'error':
+            outs.append(('error', '\n'.join(output.get('traceback', []))))
+        elif 'text' in output:
+            outs.append(('text', ''.join(output['text'])))
+        elif 'data' in output:
+            data = output['data']
+            if 'text/plain' in data:
+                outs.append(('code', ''.join(data['text/plain'])))
+            if 'image/png' in data:
+                outs.append(('png', base64.b64decode(data['image/png'], validate=False)))
+    return outs
+
+@st.cache_data(show_spinner=False)
+def load_notebook(notebook_path, mtime):
+    """Read and pre-process a notebook file, cached until its mtime changes
+
+    Returns a list of cells as {"type", "source", "outs"} dicts, so joins,
+    output classification and PNG decoding only happen on a cache miss.
+    """
+    with open(notebook_path, 'rb') as f:
+        notebook_content = json.loads(f.read())
+
+    cells = []
+    for cell in notebook_content.get('cells', []):
+        cell_type = cell.get('cell_type', '')
+        cells.append({
+            "type": cell_type,
+            "source": ''.join(cell.get('source', '')),
+            "outs": _classify_outputs(cell.get('outputs', [])) if cell_type == 'code' else [],
+        })
+    return cells
+
+def display_notebook(notebook_path, mtime):
     """Read and display a Jupyter notebook file"""
     try:
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            notebook_content = json.load(f)
-        
+        cells = load_notebook(notebook_path, mtime)
+
         st.markdown("## 📓 Notebook Contents")
 
-        for i, cell in enumerate(notebook_content.get('cells', [])):
-            cell_type = cell.get('cell_type', '')
-            source = ''.join(cell.get('source', ''))
+        # Only one window of cells is sent to the browser per rerun
+        page_count = max(1, math.ceil(len(cells) / CELLS_PER_PAGE))
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+        first = (page - 1) * CELLS_PER_PAGE
+        show_outs = st.checkbox("Show cell outputs", value=False)
+
+        for i, cell in enumerate(cells[first:first + CELLS_PER_PAGE], start=first):
+            source = cell["source"]
 
-            if cell_type == 'markdown':
-                st.markdown(f"### 📝 Markdown Cell {i+1}")
-                st.markdown(source, unsafe_allow_html=True)
-                st.markdown("---")
+            # Each cell's separator and heading share one markdown call
+            # (markdown cells include their body in it too)
+            if cell["type"] == 'markdown':
+                st.markdown(f"---\n\n### 📝 Markdown Cell {i+1}\n\n{source}\n", unsafe_allow_html=True)
 
-            elif cell_type == 'code':
-                st.markdown(f"### 💻 Code Cell {i+1}")
+            elif cell["type"] == 'code':
+                st.markdown(f"---\n\n### 💻 Code Cell {i+1}")
                 st.code(source, language='python')
 
-                outputs = cell.get('outputs', [])
-                if outputs:
-                    st.markdown("**🔽 Output:**")
-                    for output in outputs:
-                        if output.get('output_type') == 'error':
+                if show_outs and cell["outs"]:
+                    st.caption("🔽 Output:")
+                    for j, (kind, payload) in enumerate(cell["outs"]):
+                        if kind == 'error':
                             st.error("⚠️ Error in Code Execution:")
-                            st.text('\n'.join(output.get('traceback', [])))
-                        elif 'text' in output:
-                            st.text(''.join(output['text']))
-                        elif 'data' in output:
-                            data = output['data']
-                            if 'text/plain' in data:
-                                st.code(''.join(data['text/plain']), language='python')
-                            if 'image/png' in data:
-                                image_data = base64.b64decode(data['image/png'])
-                                st.image(io.BytesIO(image_data))
-
-                st.markdown("---")
+                            st.text(payload)
+                        elif kind == 'text':
+                            # Long logs only ship in full when asked for
+                            short = _truncate_text(payload)
+                            if short is not payload and st.checkbox("Show full output", key=f"full_output_{i}_{j}"):
+                                short = payload
+                            st.text(short)
+                        elif kind == 'code':
+                            st.code(payload, language='python')
+                        elif kind == 'png':
+                            st.image(payload)
 
     except Exception as e:
         st.error(f"Error loading notebook: {str(e)}")
 
+@st.fragment
+def _notebook_fragment(notebook_path, mtime):
+    """Notebook toggle and pages rerun on their own, not with the whole app"""
+    # Rendering every cell is the heaviest part of the page, so it is opt-in
+    if st.checkbox("Show notebook contents", value=False):
+        display_notebook(notebook_path, mtime)
+
 def show_gradio_image(image_path):
     if os.path.exists(image_path):
         st.image(image_path, caption="Gradio UI Snapshot", use_column_width=True)
@@ -57,6 +119,42 @@ def show_gradio_image(image_path):
 
 # ----------- UI STARTS HERE ------------
 
+_CSS_HTML = """
+<style>
+.main-header {
+    font-size: 42px;
+    font-weight: bold;
+    margin-bottom: 20px;
+}
+.highlight {
+    background-color: #f0f2f6;
+    padding: 20px;
+    border-radius: 10px;
+    margin: 20px 0;
+}
+</style>
+"""
+
+_DEPLOY_HTML = """
+<div class="highlight">
+    <ol>
+        <li><strong>Login to Hugging Face:</strong> Create an account at <a href='https://huggingface.co'>huggingface.co</a></li>
+        <li><strong>Create a New Space:</strong> Choose <code>Gradio</code> as the SDK</li>
+        <li><strong>Upload Files:</strong> Upload these:
+            <ul>
+                <li><code>main.py</code> (this file)</li>
+                <li><code>requirements.txt</code></li>
+                <li><code>Gemma3_Hugging_Face.ipynb</code></li>
+                <li><code>Gradio.png</code> (optional, for UI demo)</li>
+            </ul>
+        </li>
+        <li><strong>Set Python Environment:</strong> Hugging Face will auto-install from <code>requirements.txt</code></li>
+        <li><strong>Deploy:</strong> Click on "Commit changes" and wait 1–2 mins for the space to go live!</li>
+    </ol>
+    <p>That's it! Your NLP app is now LIVE for the world 🌍</p>
+</div>
+"""
+
 def main():
     st.set_page_config(
         page_title="Gemma Model Project",
@@ -65,41 +163,19 @@ def main():
     )
 
     # Custom Styling
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 42px;
-        font-weight: bold;
-        margin-bottom: 20px;
-    }
-    .sub-header {
-        font-size: 28px;
-        font-weight: bold;
-        margin-top: 30px;
-        margin-bottom: 15px;
-    }
-    .highlight {
-        background-color: #f0f2f6;
-        padding: 20px;
-        border-radius: 10px;
-        margin: 20px 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.html(_CSS_HTML)
 
     # Title
-    st.markdown('<div class="main-header">Gemma Language Model Project 🚀</div>', unsafe_allow_html=True)
+    st.html('<div class="main-header">Gemma Language Model Project 🚀</div>')
 
-    # Intro
+    # Intro and Project Overview
     st.markdown("""
     Welcome to my implementation of **Google's Gemma language model**!  
     This app demonstrates how I fine-tuned the model, created a user interface with Gradio,  
     and deployed it on **Hugging Face Spaces** for the world to try!
-    """)
 
-    # Project Overview
-    st.markdown('<div class="sub-header">📌 Project Overview</div>', unsafe_allow_html=True)
-    st.markdown("""
+    ## 📌 Project Overview
+
     - ✅ Fine-tuned Gemma on custom dataset  
     - 🧠 Built an interactive UI using Gradio  
     - 🚀 Deployed on Hugging Face Spaces  
@@ -107,42 +183,28 @@ def main():
     """)
 
     # Notebook Display
-    st.markdown('<div class="sub-header">📘 Gemma Notebook (Jupyter)</div>', unsafe_allow_html=True)
+    st.header("📘 Gemma Notebook (Jupyter)")
     notebook_path = "Gemma3_Hugging_Face.ipynb"
-    if os.path.exists(notebook_path):
-        display_notebook(notebook_path)
-    else:
+    # A single stat per rerun both checks the file and keys the notebook cache
+    try:
+        mtime = os.path.getmtime(notebook_path)
+    except OSError:
         st.error("Notebook file not found.")
+    else:
+        _notebook_fragment(notebook_path, mtime)
 
     # Gradio UI Image
-    st.markdown('<div class="sub-header">🎨 Gradio UI Snapshot</div>', unsafe_allow_html=True)
+    st.header("🎨 Gradio UI Snapshot")
     show_gradio_image("Gradio.png")
 
     # Deployment Guide
-    st.markdown('<div class="sub-header">🚀 How to Deploy on Hugging Face Spaces</div>', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="highlight">
-        <ol>
-            <li><strong>Login to Hugging Face:</strong> Create an account at <a href='https://huggingface.co'>huggingface.co</a></li>
-            <li><strong>Create a New Space:</strong> Choose <code>Gradio</code> as the SDK</li>
-            <li><strong>Upload Files:</strong> Upload these:
-                <ul>
-                    <li><code>main.py</code> (this file)</li>
-                    <li><code>requirements.txt</code></li>
-                    <li><code>Gemma3_Hugging_Face.ipynb</code></li>
-                    <li><code>Gradio.png</code> (optional, for UI demo)</li>
-                </ul>
-            </li>
-            <li><strong>Set Python Environment:</strong> Hugging Face will auto-install from <code>requirements.txt</code></li>
-            <li><strong>Deploy:</strong> Click on "Commit changes" and wait 1–2 mins for the space to go live!</li>
-        </ol>
-        <p>That's it! Your NLP app is now LIVE for the world 🌍</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.header("🚀 How to Deploy on Hugging Face Spaces")
+    st.html(_DEPLOY_HTML)
 
     # Outro
-    st.markdown('<div class="sub-header">📫 Connect With Me</div>', unsafe_allow_html=True)
     st.markdown("""
+    ## 📫 Connect With Me
+
     - 🧑‍💻 Made with ❤️ by a passionate ML engineer  
     - 💬 Always open to feedback, collabs, or mentorship  
     - 📧 Reach out on [LinkedIn](https://www.linkedin.com) or [GitHub](https://github.com)